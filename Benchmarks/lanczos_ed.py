@@ -0,0 +1,55 @@
+# Copyright 2021 The NetKet Authors - All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import argparse
+import time
+
+import netket as nk
+from scipy.sparse import linalg as sparse_linalg
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--L", type=int, default=20)
+parser.add_argument("--device", type=str, default="cpu", choices=["cpu", "gpu"])
+args = parser.parse_args()
+
+if args.device == "gpu":
+    try:
+        import cupyx.scipy.sparse as cusparse
+        from cupyx.scipy.sparse import linalg as cusparse_linalg
+    except ImportError:
+        print("CuPy is not available, falling back to the CPU.")
+        args.device = "cpu"
+
+g = nk.graph.Hypercube(length=args.L, n_dim=1, pbc=True)
+
+# Hilbert space of spins on the graph
+hi = nk.hilbert.Spin(s=1 / 2, N=g.n_nodes)
+
+# Ising spin Hamiltonian
+ha = nk.operator.Ising(hilbert=hi, graph=g, h=1)
+
+# The Ising Hamiltonian is real symmetric, so we can use the Lanczos method
+sm = ha.to_sparse().real
+
+time_begin = time.time()
+if args.device == "gpu":
+    sm_gpu = cusparse.csr_matrix(sm)
+    vals = cusparse_linalg.eigsh(sm_gpu, k=1, which="SA", return_eigenvectors=False)
+    vals = vals.get()
+else:
+    vals = sparse_linalg.eigsh(sm, k=1, which="SA", return_eigenvectors=False)
+time_spent = time.time() - time_begin
+
+print("Ground state energy:", vals[0])
+print(f"Diagonalization time ({args.device}):", time_spent)
@@ -39,6 +39,9 @@ class DiscreteOperator(AbstractOperator):
             x_primes: The connected states x', in a N+1-tensor.
             mels: A N-tensor containing the matrix elements :math:`O(x,x')`
                 associated to each x' for every batch.
+
+            Both arrays are C-contiguous, so that `x_primes.reshape(-1, M)` is a
+            view where every connected state is stored contiguously in memory.
         """
         n_visible = x.shape[-1]
         n_samples = x.size // n_visible
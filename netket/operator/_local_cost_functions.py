@@ -207,7 +207,6 @@ def local_value_cost(logpsi, pars, vp, mel, v):
 
 @partial(define_local_cost_function, static_argnums=0, batch_axes=(None, None, 0, 0, 0))
 def local_value_op_op_cost(logpsi, pars, σp, mel, σ):
-
-    σ_σp = jax.vmap(lambda σp, σ: jnp.hstack((σp, σ)), in_axes=(0, None))(σp, σ)
-    σ_σ = jnp.hstack((σ, σ))
+    σ_σp = jnp.concatenate((σp, jnp.broadcast_to(σ, σp.shape)), axis=-1)
+    σ_σ = jnp.concatenate((σ, σ), axis=-1)
     return jnp.sum(mel * jnp.exp(logpsi(pars, σ_σp) - logpsi(pars, σ_σ)))
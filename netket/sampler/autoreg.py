@@ -12,9 +12,11 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import numbers
 from functools import partial
 
 import jax
+from flax.core import freeze
 from jax import numpy as jnp
 
 from netket.sampler import Sampler, SamplerState
@@ -22,23 +24,25 @@ from netket.utils import struct
 from netket.utils.types import PRNGKeyT
 
 
-def batch_choice(key, a, p):
+def batch_choice(key, a, logp):
     """
     Batched version of `jax.random.choice`.
 
+    The samples are drawn with `jax.random.categorical`, which uses the Gumbel-max
+    trick and only needs a single reduction over the log-probabilities instead
+    of a cumulative sum.
+
     Attributes:
       key: a PRNGKey used as the random key.
       a: 1D array. Random samples are generated from its elements.
-      p: 2D array of shape `(batch_size, a.size)`. Each slice `p[i, :]` is
-        the probabilities associated with entries in `a` to generate a sample
+      logp: 2D array of shape `(batch_size, a.size)`. Each slice `logp[i, :]` is
+        the log-probabilities associated with entries in `a` to generate a sample
         at the index `i` of the output. Can be unnormalized.
 
     Returns:
       The generated samples as an 1D array of shape `(batch_size,)`.
     """
-    p_cumsum = p.cumsum(axis=1)
-    r = p_cumsum[:, -1:] * jax.random.uniform(key, shape=(p.shape[0], 1))
-    indices = (r > p_cumsum).sum(axis=1)
+    indices = jax.random.categorical(key, logp, axis=-1)
     out = a[indices]
     return out
 
@@ -60,9 +64,24 @@ class ARDirectSampler(Sampler):
     `ARDirectSampler.machine_pow` has no effect. Please set the model's `machine_pow` instead.
     """
 
+    scan_unroll: int = struct.field(pytree_node=False, default=1)
+    """Number of sites sampled in each iteration of the compiled loop over the sites.
+    Values larger than 1 can speed up sampling of small systems, at the cost of
+    longer compilation (default: 1)."""
+
     def __post_init__(self):
         super().__post_init__()
 
+        # accept any integer type (e.g. numpy integers), but not booleans
+        scan_unroll = self.scan_unroll
+        if (
+            isinstance(scan_unroll, bool)
+            or not isinstance(scan_unroll, numbers.Integral)
+            or scan_unroll < 1
+        ):
+            raise ValueError(f"scan_unroll ({scan_unroll}) must be a positive integer.")
+        object.__setattr__(self, "scan_unroll", int(scan_unroll))
+
         # self.machine_pow may be traced in jit
         if isinstance(self.machine_pow, int) and self.machine_pow != 2:
             raise ValueError(
@@ -74,12 +93,32 @@ class ARDirectSampler(Sampler):
         return True
 
     def _init_cache(sampler, model, σ, key):
-        variables = model.init(key, σ, 0, method=model._conditional)
-        if "cache" in variables:
-            cache = variables["cache"]
-        else:
-            cache = None
-        return cache
+        # The initial cache does not depend on the contents of `σ`, so we only
+        # initialize it for one sample per chain, and tile it along the batch
+        # dimension to cover all the `chain_length` samples of each chain.
+        # This requires the batch dimension to be the leading one of all the
+        # cached arrays, otherwise the cache is initialized for all the samples.
+        def init_cache(key, σ):
+            variables = model.init(key, σ, 0, method=model._conditional)
+            # Always return a (possibly empty) cache, so that it has a stable
+            # pytree structure when carried through `jax.lax.scan`
+            return variables.get("cache", freeze({}))
+
+        n_chains = sampler.n_chains_per_rank
+        n_reps = σ.shape[0] // n_chains
+        if n_reps > 1:
+            # Only the shapes are computed here, without initializing the cache
+            shapes = jax.eval_shape(init_cache, key, σ[:n_chains])
+            if all(
+                len(x.shape) > 0 and x.shape[0] == n_chains
+                for x in jax.tree_leaves(shapes)
+            ):
+                cache = init_cache(key, σ[:n_chains])
+                return jax.tree_map(
+                    lambda x: jnp.tile(x, (n_reps,) + (1,) * (x.ndim - 1)), cache
+                )
+
+        return init_cache(key, σ)
 
     def _init_state(sampler, model, variables, key):
         return ARDirectSamplerState(key=key)
@@ -98,51 +137,49 @@ class ARDirectSampler(Sampler):
 
 @partial(jax.jit, static_argnums=(1, 4))
 def _sample_chain(sampler, model, variables, state, chain_length):
+    variables = freeze(variables)
     if "cache" in variables:
         variables, _ = variables.pop("cache")
 
+    local_states = jnp.asarray(sampler.hilbert.local_states, dtype=sampler.dtype)
+
+    new_key, key_init, key_scan = jax.random.split(state.key, 3)
+
     def scan_fun(carry, index):
-        σ, cache, key = carry
-        if cache:
-            _variables = {**variables, "cache": cache}
-        else:
-            _variables = variables
-        new_key, key = jax.random.split(key)
+        σ, cache = carry
+        _variables = variables.copy({"cache": cache})
+        # Derive the key of each site from the same key, instead of
+        # carrying and splitting it at every step
+        key = jax.random.fold_in(key_scan, index)
 
+        # The autoregressive models take a flat batch of configurations
         p, mutables = model.apply(
             _variables,
-            σ,
+            σ.reshape((-1, sampler.hilbert.size)),
             index,
             method=model._conditional,
             mutable=["cache"],
         )
-        if "cache" in mutables:
-            cache = mutables["cache"]
-        else:
-            cache = None
+        cache = mutables.get("cache", cache)
 
-        local_states = jnp.asarray(sampler.hilbert.local_states, dtype=sampler.dtype)
-        new_σ = batch_choice(key, local_states, p)
-        σ = σ.at[:, index].set(new_σ)
+        new_σ = batch_choice(key, local_states, jnp.log(p))
+        σ = σ.at[:, :, index].set(new_σ.reshape(σ.shape[:-1]))
 
-        return (σ, cache, new_key), None
-
-    new_key, key_init, key_scan = jax.random.split(state.key, 3)
+        return (σ, cache), None
 
     # We just need a buffer for `σ` before generating each sample
     # The result does not depend on the initial contents in it
     σ = jnp.zeros(
-        (chain_length * sampler.n_chains_per_rank, sampler.hilbert.size),
+        (chain_length, sampler.n_chains_per_rank, sampler.hilbert.size),
         dtype=sampler.dtype,
     )
 
     # Initialize `cache` before generating each sample,
     # even if `variables` is not changed and `reset` is not called
-    cache = sampler._init_cache(model, σ, key_init)
+    cache = sampler._init_cache(model, σ.reshape((-1, sampler.hilbert.size)), key_init)
 
-    indices = jnp.arange(sampler.hilbert.size)
-    (σ, _, _), _ = jax.lax.scan(scan_fun, (σ, cache, key_scan), indices)
-    σ = σ.reshape((chain_length, sampler.n_chains_per_rank, sampler.hilbert.size))
+    indices = jax.lax.iota(jnp.int32, sampler.hilbert.size)
+    (σ, _), _ = jax.lax.scan(scan_fun, (σ, cache), indices, unroll=sampler.scan_unroll)
 
     new_state = state.replace(key=new_key)
     return σ, new_state
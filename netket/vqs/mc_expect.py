@@ -1,5 +1,5 @@
 from functools import partial
-from typing import Callable
+from typing import Callable, Optional
 
 import numpy as np
 
@@ -8,7 +8,7 @@ from jax import numpy as jnp
 
 from netket import jax as nkjax
 from netket.stats import Stats
-from netket.utils.types import PyTree
+from netket.utils.types import DType, PyTree
 from netket.utils.dispatch import dispatch
 
 from netket.operator import (
@@ -42,13 +42,101 @@ def local_value_squared_kernel(logpsi, pars, σ, σp, mel):
     return jnp.abs(local_value_kernel(logpsi, pars, σ, σp, mel)) ** 2
 
 
-def local_value_op_op_cost(logpsi, pars, σ, σp, mel):
+def local_value_kernel_batched(
+    logpsi, pars, σ, σp, mel, logpsi_σ=None, logpsi_σp=None, compute_dtype=None
+):
     """
-    local_value kernel for MCMixedState and generic operators
+    Batched version of `local_value_kernel`, acting on a batch of samples `σ`
+    of shape `(n_samples, N)` and on their connected configurations `σp` of
+    shape `(n_samples, n_conn, N)` at once.
+
+    If `compute_dtype` is given (e.g. `jnp.bfloat16`), the terms of the sum are
+    computed in that precision (see `_sum_local_terms`).
+    """
+    if logpsi_σ is None:
+        logpsi_σ = logpsi(pars, σ)
+    if logpsi_σp is None:
+        logpsi_σp = _logpsi_batched(logpsi, pars, σp)
+
+    return _sum_local_terms(mel, logpsi_σp - logpsi_σ[:, None], compute_dtype)
+
+
+def local_value_squared_kernel_batched(
+    logpsi, pars, σ, σp, mel, logpsi_σ=None, logpsi_σp=None, compute_dtype=None
+):
+    """
+    Batched version of `local_value_squared_kernel`.
+    """
+    return (
+        jnp.abs(
+            local_value_kernel_batched(
+                logpsi, pars, σ, σp, mel, logpsi_σ, logpsi_σp, compute_dtype
+            )
+        )
+        ** 2
+    )
+
+
+def local_value_op_op_cost_batched(
+    logpsi, pars, σ, σp, mel, logpsi_σ=None, logpsi_σp=None, compute_dtype=None
+):
+    """
+    local_value kernel for MCMixedState and generic operators, acting on a
+    batch of samples at once.
+
+    `σ` are the diagonal configurations `(σ, σ)` of the doubled hilbert space,
+    with shape `(n_samples, 2N)`, while `σp` are the configurations connected
+    to `σ` by the physical operator, with shape `(n_samples, n_conn, N)`.
+    """
+    σ_σ = σ
+    σ = σ_σ[:, σ_σ.shape[-1] // 2 :]
+    σ_σp = jnp.concatenate((σp, jnp.broadcast_to(σ[:, None, :], σp.shape)), axis=-1)
+    if logpsi_σ is None:
+        logpsi_σ = logpsi(pars, σ_σ)
+    if logpsi_σp is None:
+        logpsi_σp = _logpsi_batched(logpsi, pars, σ_σp)
+    return _sum_local_terms(mel, logpsi_σp - logpsi_σ[:, None], compute_dtype)
+
+
+def _sum_local_terms(mel, Δlogpsi, compute_dtype=None):
+    """
+    Computes `sum(mel * exp(Δlogpsi))` over the last axis.
+
+    If `compute_dtype` is given (e.g. `jnp.bfloat16`), the terms of the sum are
+    computed in that precision, while the sum is accumulated in the original
+    one. This is ignored if `Δlogpsi` or the matrix elements are complex.
+    """
+    if (
+        compute_dtype is not None
+        and not jnp.iscomplexobj(Δlogpsi)
+        and not jnp.iscomplexobj(mel)
+    ):
+        dtype = jnp.result_type(mel, Δlogpsi)
+        terms = mel.astype(compute_dtype) * jnp.exp(Δlogpsi.astype(compute_dtype))
+        return jnp.sum(terms.astype(dtype), axis=-1)
+
+    return jnp.sum(mel * jnp.exp(Δlogpsi), axis=-1)
+
+
+def _logpsi_batched(logpsi, pars, σp):
+    """
+    Computes `logpsi(pars, σp)` for `σp` with an arbitrary number of batch
+    dimensions, in a single call.
+    """
+    σp_flat = σp.reshape((-1, σp.shape[-1]))
+    return logpsi(pars, σp_flat).reshape(σp.shape[:-1])
+
+
+def _logpsi_distinct(logpsi, pars, σp, unique_size):
+    """
+    Computes `logpsi(pars, σp)` evaluating the network only once for every
+    distinct configuration in `σp`, which must be at most `unique_size`.
     """
-    σ_σp = jax.vmap(lambda σp, σ: jnp.hstack((σp, σ)), in_axes=(0, None))(σp, σ)
-    σ_σ = jnp.hstack((σ, σ))
-    return jnp.sum(mel * jnp.exp(logpsi(pars, σ_σp) - logpsi(pars, σ_σ)))
+    σp_flat = σp.reshape((-1, σp.shape[-1]))
+    σp_unique, inverse = jnp.unique(
+        σp_flat, axis=0, return_inverse=True, size=unique_size
+    )
+    return logpsi(pars, σp_unique)[inverse].reshape(σp.shape[:-1])
 
 
 @dispatch.multi((MCState, Squared), (MCMixedState, Squared))
@@ -56,13 +144,18 @@ def expect(vstate: MCState, Ô: Squared) -> Stats:  # noqa: F811
     _check_hilbert(vstate, Ô)
 
     σ = vstate.samples
+    n_chains = σ.shape[0]
+    σ = σ.reshape((-1, σ.shape[-1]))
 
-    σp, mels = Ô.parent.get_conn_padded(np.asarray(σ).reshape((-1, σ.shape[-1])))
+    σp, mels = Ô.parent.get_conn_padded(np.asarray(σ))
 
     return _expect(
         vstate.sampler.machine_pow,
         vstate._apply_fun,
-        local_value_squared_kernel,
+        local_value_squared_kernel_batched,
+        vstate.unique_size,
+        vstate.compute_dtype,
+        n_chains,
         vstate.parameters,
         vstate.model_state,
         σ,
@@ -76,13 +169,18 @@ def expect(vstate: MCState, Ô: DiscreteOperator) -> Stats:  # noqa: F811
     _check_hilbert(vstate, Ô)
 
     σ = vstate.samples
+    n_chains = σ.shape[0]
+    σ = σ.reshape((-1, σ.shape[-1]))
 
-    σp, mels = Ô.get_conn_padded(np.asarray(σ).reshape((-1, σ.shape[-1])))
+    σp, mels = Ô.get_conn_padded(np.asarray(σ))
 
     return _expect(
         vstate.sampler.machine_pow,
         vstate._apply_fun,
-        local_value_kernel,
+        local_value_kernel_batched,
+        vstate.unique_size,
+        vstate.compute_dtype,
+        n_chains,
         vstate.parameters,
         vstate.model_state,
         σ,
@@ -96,36 +194,48 @@ def expect(vstate: MCMixedState, Ô: DiscreteOperator) -> Stats:  # noqa: F811
     _check_hilbert(vstate.diagonal, Ô)
 
     σ = vstate.diagonal.samples
+    n_chains = σ.shape[0]
+    σ = σ.reshape((-1, σ.shape[-1]))
+
+    σp, mels = Ô.get_conn_padded(np.asarray(σ))
 
-    σp, mels = Ô.get_conn_padded(np.asarray(σ).reshape((-1, σ.shape[-1])))
+    # the local kernel works on the diagonal configurations (σ, σ)
+    σ_σ = jnp.concatenate((σ, σ), axis=-1)
 
     return _expect(
         vstate.sampler.machine_pow,
         vstate._apply_fun,
-        local_value_op_op_cost,
+        local_value_op_op_cost_batched,
+        None,
+        vstate.compute_dtype,
+        n_chains,
         vstate.parameters,
         vstate.model_state,
-        σ,
+        σ_σ,
         σp,
         mels,
     )
 
 
-@partial(jax.jit, static_argnums=(1, 2))
+@partial(jax.jit, static_argnums=(1, 2, 3, 4, 5))
 def _expect(
     machine_pow: int,
     model_apply_fun: Callable,
     local_value_kernel: Callable,
+    unique_size: Optional[int],
+    compute_dtype: Optional[DType],
+    n_chains: int,
     parameters: PyTree,
     model_state: PyTree,
     σ: jnp.ndarray,
     σp: jnp.ndarray,
     mels: jnp.ndarray,
 ) -> Stats:
-    σ_shape = σ.shape
-
-    if jnp.ndim(σ) != 2:
-        σ = σ.reshape((-1, σ_shape[-1]))
+    """
+    Computes the expectation value of an operator given the samples `σ` with
+    shape `(n_samples, N)`, already flattened by the caller, and their
+    connected configurations `σp` with shape `(n_samples, n_conn, N)`.
+    """
 
     def logpsi(w, σ):
         return model_apply_fun({"params": w, **model_state}, σ)
@@ -133,14 +243,27 @@ def _expect(
     def log_pdf(w, σ):
         return machine_pow * model_apply_fun({"params": w, **model_state}, σ).real
 
-    local_value_vmap = jax.vmap(
-        partial(local_value_kernel, logpsi),
-        in_axes=(None, 0, 0, 0),
-        out_axes=0,
-    )
+    # Evaluate the network on the samples only once and reuse the result
+    # in the local kernel, instead of recomputing it for every sample.
+    logpsi_σ = logpsi(parameters, σ)
+
+    # If the caller guarantees that the connected configurations contain at
+    # most `unique_size` distinct ones, evaluate the network only once on each.
+    if unique_size is not None:
+        logpsi_σp = _logpsi_distinct(logpsi, parameters, σp, unique_size)
+    else:
+        logpsi_σp = None
 
     _, Ō_stats = nkjax.expect(
-        log_pdf, local_value_vmap, parameters, σ, σp, mels, n_chains=σ_shape[0]
+        log_pdf,
+        partial(local_value_kernel, logpsi, compute_dtype=compute_dtype),
+        parameters,
+        σ,
+        σp,
+        mels,
+        logpsi_σ,
+        logpsi_σp,
+        n_chains=n_chains,
     )
 
     return Ō_stats
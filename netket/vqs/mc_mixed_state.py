@@ -38,7 +38,7 @@ ATrainFunType = Callable[
 
 
 def apply_diagonal(bare_afun, w, x, *args, **kwargs):
-    x = jnp.hstack((x, x))
+    x = jnp.concatenate((x, x), axis=-1)
     return bare_afun(w, x, *args, **kwargs)
 
 
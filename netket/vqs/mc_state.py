@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import numbers
 import warnings
 from functools import partial
 from typing import Any, Callable, Dict, Optional, Union
@@ -28,7 +29,7 @@ from netket import jax as nkjax
 from netket import nn
 from netket.sampler import Sampler, SamplerState
 from netket.utils import maybe_wrap_module, deprecated, warn_deprecation, mpi, wrap_afun
-from netket.utils.types import PyTree, SeedT, NNInitFunc
+from netket.utils.types import PyTree, SeedT, NNInitFunc, DType
 from netket.optimizer import LinearOperator
 from netket.optimizer.qgt import QGTAuto
 
@@ -83,6 +84,11 @@ class MCState(VariationalState):
     _samples: Optional[jnp.ndarray] = None
     """Cached samples obtained with the last sampling."""
 
+    _unique_size: Optional[int] = None
+    """Upper bound on the number of distinct connected configurations."""
+    _compute_dtype: Optional[DType] = None
+    """Reduced precision used to compute the terms of the local values."""
+
     _init_fun: Callable = None
     """The function used to initialise the parameters and model_state"""
     _apply_fun: Callable = None
@@ -105,6 +111,8 @@ class MCState(VariationalState):
         sampler_seed: Optional[SeedT] = None,
         mutable: bool = False,
         training_kwargs: Dict = {},
+        unique_size: Optional[int] = None,
+        compute_dtype: Optional[DType] = None,
     ):
         """
         Constructs the MCState.
@@ -132,6 +140,11 @@ class MCState(VariationalState):
             sample_fun: Optional function used to sample the state, if it is not the same as `apply_fun`.
             training_kwargs: a dict containing the optionaal keyword arguments to be passed to the apply_fun during training.
                 Useful for example when you have a batchnorm layer that constructs the average/mean only during training.
+            unique_size: Optional upper bound on the number of distinct configurations connected to the samples by
+                an operator, used to evaluate the model only once on each of them when computing expectation values
+                (default=None). See :attr:`MCState.unique_size`.
+            compute_dtype: Optional floating point dtype (e.g. `jnp.bfloat16`) used to compute the terms of the local
+                values when computing expectation values (default=None). See :attr:`MCState.compute_dtype`.
             n_discard: DEPRECATED. Please use `n_discard_per_chain` which has the same behaviour.
         """
         super().__init__(sampler.hilbert)
@@ -219,6 +232,9 @@ class MCState(VariationalState):
 
         self.n_discard_per_chain = n_discard_per_chain
 
+        self.unique_size = unique_size
+        self.compute_dtype = compute_dtype
+
     def init(self, seed=None, dtype=None):
         """
         Initialises the variational parameters of the variational state.
@@ -338,6 +354,57 @@ class MCState(VariationalState):
             else self.n_samples // 10
         )
 
+    @property
+    def unique_size(self) -> Optional[int]:
+        """
+        Optional upper bound on the number of distinct configurations connected
+        to the samples by an operator. If set, the model is evaluated only once
+        on every distinct connected configuration when computing expectation
+        values, which is worth it only if there are many duplicates among them.
+
+        Results are wrong if the bound is smaller than the actual number of
+        distinct connected configurations.
+
+        :class:`MCMixedState` ignores it when computing the expectation value
+        of a :class:`~netket.operator.DiscreteOperator`.
+        """
+        return self._unique_size
+
+    @unique_size.setter
+    def unique_size(self, unique_size: Optional[int]):
+        if unique_size is not None and (
+            isinstance(unique_size, bool)
+            or not isinstance(unique_size, numbers.Integral)
+            or unique_size < 1
+        ):
+            raise ValueError(
+                f"Invalid unique_size={unique_size}: must be a positive integer or None."
+            )
+
+        self._unique_size = int(unique_size) if unique_size is not None else None
+
+    @property
+    def compute_dtype(self) -> Optional[DType]:
+        """
+        Optional reduced precision floating point dtype (e.g. `jnp.bfloat16`)
+        used to compute the terms of the local values of real wavefunctions and
+        operators when computing expectation values. The terms are summed in
+        the original precision. It has no effect on complex wavefunctions or
+        operators.
+        """
+        return self._compute_dtype
+
+    @compute_dtype.setter
+    def compute_dtype(self, compute_dtype: Optional[DType]):
+        if compute_dtype is not None:
+            if not jnp.issubdtype(compute_dtype, jnp.floating):
+                raise ValueError(
+                    f"Invalid compute_dtype={compute_dtype}: must be a floating point dtype or None."
+                )
+            compute_dtype = jnp.dtype(compute_dtype)
+
+        self._compute_dtype = compute_dtype
+
     # TODO: deprecate
     @property
     def n_discard(self) -> int:
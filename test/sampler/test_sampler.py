@@ -103,6 +103,9 @@ samplers["Metropolis(Custom: Sx): Spin"] = nk.sampler.MetropolisCustom(
 # samplers["MetropolisPT(Custom: Sx): Spin"] = nkx.sampler.MetropolisCustomPt(hi, move_operators=move_op, n_replicas=4)
 
 samplers["Autoregressive: Spin 1/2"] = nk.sampler.ARDirectSampler(hi, n_chains=16)
+samplers["Autoregressive(Unrolled): Spin 1/2"] = nk.sampler.ARDirectSampler(
+    hi, n_chains=16, scan_unroll=4
+)
 samplers["Autoregressive: Spin 1"] = nk.sampler.ARDirectSampler(hi_spin1, n_chains=16)
 samplers["Autoregressive: Fock"] = nk.sampler.ARDirectSampler(hib_u, n_chains=16)
 
@@ -401,6 +404,9 @@ def test_throwing(model_and_weights):
     with pytest.raises(ValueError):
         nk.sampler.ARDirectSampler(hi, machine_pow=1)
 
+    with pytest.raises(ValueError):
+        nk.sampler.ARDirectSampler(hi, scan_unroll=0)
+
 
 def test_exact_sampler(sampler):
     known_exact_samplers = (nk.sampler.ExactSampler, nk.sampler.ARDirectSampler)
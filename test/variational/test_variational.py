@@ -201,6 +201,47 @@ def test_expect_numpysampler_works(vstate, operator):
     assert isinstance(out, nk.stats.Stats)
 
 
+@pytest.mark.parametrize(
+    "operator",
+    [
+        pytest.param(
+            op,
+            id=name,
+        )
+        for name, op in operators.items()
+    ],
+)
+def test_expect_unique_size(vstate, operator):
+    with raises(ValueError):
+        vstate.unique_size = 0
+
+    O_stat = vstate.expect(operator)
+
+    # every connected configuration belongs to the hilbert space
+    vstate.unique_size = vstate.hilbert.n_states
+    O_stat_unique = vstate.expect(operator)
+
+    np.testing.assert_allclose(O_stat_unique.mean, O_stat.mean)
+    np.testing.assert_allclose(O_stat_unique.variance, O_stat.variance)
+
+
+def test_expect_compute_dtype():
+    sa = nk.sampler.ExactSampler(hilbert=hi, n_chains=16)
+    vstate = nk.vqs.MCState(sa, machines["model:(R->R)"], n_samples=1000, seed=SEED)
+    operator = operators["operator:(Hermitian Real)"]
+
+    O_stat = vstate.expect(operator)
+
+    with raises(ValueError):
+        vstate.compute_dtype = jax.numpy.int32
+
+    vstate.compute_dtype = jax.numpy.bfloat16
+    O_stat_bf16 = vstate.expect(operator)
+
+    assert O_stat_bf16.mean.dtype == O_stat.mean.dtype
+    np.testing.assert_allclose(O_stat_bf16.mean, O_stat.mean, rtol=5e-2)
+
+
 def test_qutip_conversion(vstate):
     # skip test if qutip not installed
     pytest.importorskip("qutip")